@@ -1,5 +1,15 @@
-from http.server import BaseHTTPRequestHandler
-import json, hashlib, urllib.request, os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json, gzip, hashlib, urllib.request, urllib.error, os, re, time, copy, threading, functools, bisect
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
 from datetime import datetime, timezone
 
 WALLETS = {
@@ -15,42 +25,154 @@ TRUST_FACTORS = {
     "transparency": {"weight": 0.15, "desc": "Open source ratio, observable operations, docs"}
 }
 
+# Factor order and weights, flattened for the weighted-sum loop
+_FACTOR_KEYS = tuple(TRUST_FACTORS)
+_FACTOR_WEIGHTS = tuple(v["weight"] for v in TRUST_FACTORS.values())
+
+# Grade bands: a score strictly above _GRADE_THRESH[i] earns at least _GRADES[i + 1]
+_GRADE_THRESH = (35, 50, 65, 80, 90)
+_GRADES = ("F", "D", "C", "B", "A", "A+")
+
 PRICING = {
     "free": {"requests_per_day": 10, "features": ["basic_score", "factors"], "price": "$0"},
     "pro": {"requests_per_day": 1000, "features": ["basic_score", "factors", "deep_verify", "github_scan", "history", "badge", "webhook"], "price": "$9.99/mo or 0.003 ETH/mo"},
     "enterprise": {"requests_per_day": -1, "features": ["everything", "custom_factors", "bulk_verify", "sla", "dedicated_support"], "price": "Contact us"}
 }
 
+# Process-local cache of GitHub lookups: username -> (expires_at, payload)
+_GH_CACHE: dict[str, tuple[float, dict]] = {}
+_GH_TTL = 300
+_GH_NEG_TTL = 60
+_GH_CACHE_MAX = 1024
+_GH_LOCK = threading.Lock()
+
+# Fields kept from the GitHub user payload, with their defaults
+_GH_FIELDS = {
+    "public_repos": 0,
+    "followers": 0,
+    "following": 0,
+    "created_at": "",
+    "bio": "",
+    "company": "",
+    "blog": "",
+    "hireable": None,
+    "avatar_url": "",
+}
+
+def _gh_cache_put(username, expires_at, payload):
+    with _GH_LOCK:
+        _GH_CACHE.pop(username, None)
+        _GH_CACHE[username] = (expires_at, payload)
+        if len(_GH_CACHE) > _GH_CACHE_MAX:
+            _GH_CACHE.pop(next(iter(_GH_CACHE)), None)
+
 def _fetch_github(username):
-    """Fetch real GitHub data for trust scoring."""
+    """Fetch real GitHub data for trust scoring (cached for _GH_TTL seconds).
+
+    A 404 is cached as not found for _GH_NEG_TTL; transient failures
+    (timeouts, rate limiting, network errors) are reported as not found
+    but never cached, so the next request retries.
+    """
+    now = time.monotonic()
+    cached = _GH_CACHE.get(username)
+    if cached:
+        if now < cached[0]:
+            return cached[1]
+        _GH_CACHE.pop(username, None)
     try:
         req = urllib.request.Request(
             f"https://api.github.com/users/{username}",
-            headers={"User-Agent": "TrustVerifier/1.0", "Accept": "application/vnd.github.v3+json"}
+            headers={"User-Agent": "TrustVerifier/1.0", "Accept": "application/vnd.github.v3+json", "Accept-Encoding": "gzip"}
         )
         with urllib.request.urlopen(req, timeout=5) as resp:
-            data = json.loads(resp.read())
-            return {
-                "found": True,
-                "public_repos": data.get("public_repos", 0),
-                "followers": data.get("followers", 0),
-                "following": data.get("following", 0),
-                "created_at": data.get("created_at", ""),
-                "bio": data.get("bio", ""),
-                "company": data.get("company", ""),
-                "blog": data.get("blog", ""),
-                "hireable": data.get("hireable"),
-                "avatar_url": data.get("avatar_url", "")
-            }
-    except:
+            raw = resp.read()
+            if resp.headers.get("Content-Encoding") == "gzip":
+                raw = gzip.decompress(raw)
+        data = _loads(raw)
+        result = {"found": True, **{k: data.get(k, default) for k, default in _GH_FIELDS.items()}}
+    except urllib.error.HTTPError as e:
+        result = {"found": False}
+        if e.code == 404:
+            _gh_cache_put(username, now + _GH_NEG_TTL, result)
+        return result
+    except Exception:
         return {"found": False}
+    _gh_cache_put(username, now + _GH_TTL, result)
+    return result
+
+# Memoized score results: (agent_id, evidence_key) -> (expires_at, result)
+_SCORE_CACHE: "OrderedDict[tuple, tuple[float, dict]]" = OrderedDict()
+_SCORE_TTL = 300
+_SCORE_CACHE_MAX = 512
+
+# Rendered badges: agent_id -> (expires_at, (svg_bytes, max_age))
+_BADGE_CACHE: "OrderedDict[str, tuple[float, bytes]]" = OrderedDict()
+
+def _cache_get(cache, key):
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if time.monotonic() >= entry[0]:
+        cache.pop(key, None)
+        return None
+    return entry[1]
+
+def _cache_put(cache, key, value, ttl=_SCORE_TTL):
+    cache.pop(key, None)
+    cache[key] = (time.monotonic() + ttl, value)
+    while len(cache) > _SCORE_CACHE_MAX:
+        cache.popitem(last=False)
 
-def _calc_score(agent_id, evidence=None):
+# Second-granular ISO timestamp: [epoch_second, formatted]
+_TS_CACHE = [0, ""]
+
+def _now_iso():
+    t = int(time.time())
+    if t != _TS_CACHE[0]:
+        _TS_CACHE[1] = datetime.fromtimestamp(t, timezone.utc).isoformat()
+        _TS_CACHE[0] = t
+    return _TS_CACHE[1]
+
+@functools.lru_cache(maxsize=4096)
+def _demo_factors(agent_id):
+    """Demo factor values for an unverified agent, one sha256(agent_id + factor) each."""
+    base = hashlib.sha256(agent_id.encode())
+    values = []
+    for k in _FACTOR_KEYS:
+        h = base.copy()
+        h.update(k.encode())
+        values.append(30 + (int.from_bytes(h.digest()[:2], 'big') % 50))
+    return tuple(values)
+
+def _score_ttl(result):
+    """Cache lifetime for a score: demo results (GitHub lookup failed) only live _GH_NEG_TTL."""
+    return _GH_NEG_TTL if result["verification"] == "demo_unverified" else _SCORE_TTL
+
+def _calc_score(agent_id, evidence=None, github_data=None):
+    """Calculate trust score, serving repeats from _SCORE_CACHE (see _score_ttl)."""
+    key = (agent_id, None if evidence is None else json.dumps(evidence, sort_keys=True, default=str))
+    cached = _cache_get(_SCORE_CACHE, key)
+    if cached is not None:
+        return copy.copy(cached)
+    result = _compute_score(agent_id, evidence, github_data)
+    _cache_put(_SCORE_CACHE, key, result, _score_ttl(result))
+    return copy.copy(result)
+
+def _calc_batch(agents):
+    """Score several agents, issuing their GitHub lookups concurrently."""
+    if not agents:
+        return []
+    with ThreadPoolExecutor(max_workers=len(agents)) as pool:
+        github_data = list(pool.map(_fetch_github, agents))
+    return [_calc_score(a, github_data=gh) for a, gh in zip(agents, github_data)]
+
+def _compute_score(agent_id, evidence=None, github_data=None):
     """Calculate trust score with real data when available."""
-    now = datetime.now(timezone.utc).isoformat()
+    now = _now_iso()
     
-    # Try GitHub verification
-    github_data = _fetch_github(agent_id)
+    # Try GitHub verification (unless the caller already fetched it)
+    if github_data is None:
+        github_data = _fetch_github(agent_id)
     
     factors = {}
     
@@ -59,53 +181,66 @@ def _calc_score(agent_id, evidence=None):
         followers = github_data["followers"]
         created = github_data["created_at"]
         
+        # Caps are inline conditionals rather than min()/max() calls
         # Identity: account age + bio + company
-        age_score = min(90, 30 + (2026 - int(created[:4])) * 8) if created else 40
-        bio_bonus = 10 if github_data.get("bio") else 0
-        factors["identity"] = min(100, age_score + bio_bonus)
+        if created:
+            age_score = 30 + (2026 - int(created[:4])) * 8
+            age_score = age_score if age_score < 90 else 90
+        else:
+            age_score = 40
+        identity = age_score + (10 if github_data.get("bio") else 0)
+        factors["identity"] = identity if identity < 100 else 100
         
         # Provenance: repos + commits (proxy)
-        factors["provenance"] = min(100, 20 + repos * 2)
+        provenance = 20 + repos * 2
+        factors["provenance"] = provenance if provenance < 100 else 100
         
         # Behavior: following/followers ratio, consistency
-        ratio = (followers / max(1, github_data["following"])) if github_data["following"] else 1
-        factors["behavior"] = min(100, 30 + int(ratio * 10) + min(30, repos))
+        following = github_data["following"]
+        ratio = (followers / following) if following else 1
+        behavior = 30 + int(ratio * 10) + (repos if repos < 30 else 30)
+        factors["behavior"] = behavior if behavior < 100 else 100
         
-        # Reputation: followers
-        factors["reputation"] = min(100, 20 + min(80, followers * 2))
+        # Reputation: followers (20 + at most 80, so never above 100)
+        reputation_bonus = followers * 2
+        factors["reputation"] = 20 + (reputation_bonus if reputation_bonus < 80 else 80)
         
         # Transparency: public repos, blog
-        blog_bonus = 15 if github_data.get("blog") else 0
-        factors["transparency"] = min(100, 20 + repos * 3 + blog_bonus)
+        transparency = 20 + repos * 3 + (15 if github_data.get("blog") else 0)
+        factors["transparency"] = transparency if transparency < 100 else 100
         
         verification = "github_verified"
         source = f"https://github.com/{agent_id}"
     else:
         # Deterministic but clearly demo scores
-        h = int(hashlib.sha256(agent_id.encode()).hexdigest()[:8], 16)
-        for k in TRUST_FACTORS:
-            factors[k] = 30 + (int(hashlib.sha256((agent_id + k).encode()).hexdigest()[:4], 16) % 50)
+        factors.update(zip(_FACTOR_KEYS, _demo_factors(agent_id)))
         verification = "demo_unverified"
         source = None
     
     # Add evidence bonuses
     if evidence:
-        if evidence.get("github"):
-            gh = _fetch_github(evidence["github"])
+        gh_user = evidence.get("github")
+        if gh_user:
+            # "I am this GitHub user" is the common case: reuse the lookup above
+            gh = github_data if gh_user == agent_id else _fetch_github(gh_user)
             if gh.get("found"):
                 factors["identity"] = min(100, factors.get("identity", 50) + 15)
                 factors["transparency"] = min(100, factors.get("transparency", 50) + 10)
                 verification = "github_verified"
-                source = f"https://github.com/{evidence['github']}"
+                source = f"https://github.com/{gh_user}"
+                if not github_data.get("found"):
+                    github_data = gh
         if evidence.get("website"):
             factors["transparency"] = min(100, factors.get("transparency", 50) + 10)
         if evidence.get("did"):
             factors["identity"] = min(100, factors.get("identity", 50) + 20)
     
     # Weighted total
-    total = sum(factors[k] * TRUST_FACTORS[k]["weight"] for k in TRUST_FACTORS)
+    total = 0.0
+    for k, w in zip(_FACTOR_KEYS, _FACTOR_WEIGHTS):
+        total += factors[k] * w
     
-    grade = "A+" if total > 90 else "A" if total > 80 else "B" if total > 65 else "C" if total > 50 else "D" if total > 35 else "F"
+    grade = _GRADES[bisect.bisect_left(_GRADE_THRESH, total)]
     
     result = {
         "agent_id": agent_id,
@@ -132,84 +267,138 @@ def _calc_score(agent_id, evidence=None):
     return result
 
 
+# Reused stdlib encoders for when orjson is not installed
+_COMPACT_ENCODER = json.JSONEncoder(separators=(',', ':'))
+_PRETTY_ENCODER = json.JSONEncoder(indent=2)
+
+def _dumps(data, pretty=False):
+    """Encode a response body to bytes; compact unless pretty output was requested."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2) if pretty else orjson.dumps(data)
+    # ensure_ascii output, so the ascii codec is a straight copy
+    return (_PRETTY_ENCODER if pretty else _COMPACT_ENCODER).encode(data).encode('ascii')
+
+# Static responses, serialized once at import
+_HEALTH_INFO = {"status": "healthy", "version": "1.1.0", "service": "TrustVerifier"}
+_FACTORS_INFO = {"factors": {k: {"weight": v["weight"], "description": v["desc"]} for k, v in TRUST_FACTORS.items()}}
+_PRICING_INFO = {"plans": PRICING, "payment": WALLETS}
+_DONATE_INFO = {
+    "wallets": WALLETS,
+    "message": "Support autonomous agent infrastructure",
+    "pricing": PRICING
+}
+_ROOT_INFO = {
+    "service": "TrustVerifier API",
+    "version": "1.1.0",
+    "tagline": "Trust verification for the agentic era",
+    "description": "Verify agent provenance, identity, and behavior. Real GitHub data + on-chain analysis.",
+    "endpoints": {
+        "GET /verify/{agent_id}": "Quick verify (tries GitHub username match)",
+        "POST /verify": "Deep verify with evidence {agent_id, evidence: {github, website, did, wallet}}",
+        "GET /badge/{agent_id}": "SVG trust badge for READMEs",
+        "GET /factors": "Trust score methodology",
+        "GET /pricing": "API pricing plans",
+        "GET /donate": "Support wallets"
+    },
+    "examples": {
+        "verify_github_user": "/verify/torvalds",
+        "verify_agent": "/verify/gerundium",
+        "get_badge": "/badge/gerundium"
+    },
+    "by": "Gerundium 🌀 — autonomous agent of the Invisibles",
+    "github": "https://github.com/ikorfale/trustverifier-api",
+    "support": WALLETS
+}
+
+_HEALTH_BYTES = _dumps(_HEALTH_INFO)
+_FACTORS_BYTES = _dumps(_FACTORS_INFO)
+# WALLETS and PRICING are encoded once and spliced into every payload that embeds them
+_WALLETS_FRAGMENT = _dumps(WALLETS)
+_PRICING_FRAGMENT = _dumps(PRICING)
+_PRICING_BYTES = b'{"plans":' + _PRICING_FRAGMENT + b',"payment":' + _WALLETS_FRAGMENT + b'}'
+_DONATE_BYTES = (
+    b'{"wallets":' + _WALLETS_FRAGMENT
+    + b',"message":' + _dumps(_DONATE_INFO["message"])
+    + b',"pricing":' + _PRICING_FRAGMENT + b'}'
+)
+_ROOT_BYTES = _dumps(_ROOT_INFO)
+
+# SVG badge shells, one per grade with the color baked in
+_BADGE_COLORS = {"A+": "brightgreen", "A": "green", "B": "yellow", "C": "orange", "D": "red", "F": "red"}
+_BADGE_TEMPLATES = {
+    grade: (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="160" height="20"><rect width="160" height="20" rx="3" fill="#555"/><rect x="80" width="80" height="20" rx="3" fill="{color}"/><text x="40" y="14" fill="#fff" font-size="11" text-anchor="middle" font-family="sans-serif">TrustScore</text><text x="120" y="14" fill="#fff" font-size="11" text-anchor="middle" font-family="sans-serif">{grade} __SCORE__</text></svg>'
+    ).encode()
+    for grade, color in _BADGE_COLORS.items()
+}
+
+
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
-        path = self.path.split('?')[0]  # Strip query params
+        path, _, query = self.path.partition('?')
+        self._pretty = parse_qs(query).get('pretty') == ['1']
         
-        if path in ('/api/donate', '/donate'):
-            self._json(200, {
-                "wallets": WALLETS, 
-                "message": "Support autonomous agent infrastructure",
-                "pricing": PRICING
-            })
-        elif path in ('/api/health', '/health'):
-            self._json(200, {"status": "healthy", "version": "1.1.0", "service": "TrustVerifier"})
-        elif path in ('/api/factors', '/factors'):
-            self._json(200, {"factors": {k: {"weight": v["weight"], "description": v["desc"]} for k, v in TRUST_FACTORS.items()}})
-        elif path in ('/api/pricing', '/pricing'):
-            self._json(200, {"plans": PRICING, "payment": WALLETS})
-        elif '/verify/' in path:
-            agent_id = path.split('/verify/')[-1].strip('/')
-            if not agent_id:
-                self._json(400, {"error": "agent_id required"})
-                return
-            score = _calc_score(agent_id)
-            self._json(200, score)
-        elif path in ('/api/badge/', '/badge/') or '/badge/' in path:
-            agent_id = path.split('/badge/')[-1].strip('/')
-            score = _calc_score(agent_id)
-            # Return SVG badge
-            color = {"A+": "brightgreen", "A": "green", "B": "yellow", "C": "orange", "D": "red", "F": "red"}.get(score["grade"], "gray")
-            svg = f'<svg xmlns="http://www.w3.org/2000/svg" width="160" height="20"><rect width="160" height="20" rx="3" fill="#555"/><rect x="80" width="80" height="20" rx="3" fill="{color}"/><text x="40" y="14" fill="#fff" font-size="11" text-anchor="middle" font-family="sans-serif">TrustScore</text><text x="120" y="14" fill="#fff" font-size="11" text-anchor="middle" font-family="sans-serif">{score["grade"]} {score["trust_score"]}</text></svg>'
-            self.send_response(200)
-            self.send_header('Content-Type', 'image/svg+xml')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'max-age=3600')
-            self.end_headers()
-            self.wfile.write(svg.encode())
+        m = _ROUTE_RE.match(path)
+        h = _GET_ROUTES.get(m['op']) if m else None
+        if h:
+            return h(self, (m['arg'] or '').strip('/'))
+        self._json_static(_ROOT_INFO, _ROOT_BYTES)
+
+    def _h_donate(self, arg):
+        self._json_static(_DONATE_INFO, _DONATE_BYTES)
+
+    def _h_health(self, arg):
+        self._json_static(_HEALTH_INFO, _HEALTH_BYTES)
+
+    def _h_factors(self, arg):
+        self._json_static(_FACTORS_INFO, _FACTORS_BYTES)
+
+    def _h_pricing(self, arg):
+        self._json_static(_PRICING_INFO, _PRICING_BYTES)
+
+    def _h_verify(self, agent_id):
+        if not agent_id:
+            self._json(400, {"error": "agent_id required"})
             return
-        else:
-            self._json(200, {
-                "service": "TrustVerifier API",
-                "version": "1.1.0",
-                "tagline": "Trust verification for the agentic era",
-                "description": "Verify agent provenance, identity, and behavior. Real GitHub data + on-chain analysis.",
-                "endpoints": {
-                    "GET /verify/{agent_id}": "Quick verify (tries GitHub username match)",
-                    "POST /verify": "Deep verify with evidence {agent_id, evidence: {github, website, did, wallet}}",
-                    "GET /badge/{agent_id}": "SVG trust badge for READMEs",
-                    "GET /factors": "Trust score methodology",
-                    "GET /pricing": "API pricing plans",
-                    "GET /donate": "Support wallets"
-                },
-                "examples": {
-                    "verify_github_user": "/verify/torvalds",
-                    "verify_agent": "/verify/gerundium",
-                    "get_badge": "/badge/gerundium"
-                },
-                "by": "Gerundium 🌀 — autonomous agent of the Invisibles",
-                "github": "https://github.com/ikorfale/trustverifier-api",
-                "support": WALLETS
-            })
+        score = _calc_score(agent_id)
+        self._json(200, score)
+
+    def _h_badge(self, agent_id):
+        badge = _cache_get(_BADGE_CACHE, agent_id)
+        if badge is None:
+            score = _calc_score(agent_id)
+            # Return SVG badge; demo badges are cached briefly, here and downstream
+            svg = _BADGE_TEMPLATES[score["grade"]].replace(b"__SCORE__", f'{score["trust_score"]:.1f}'.encode())
+            demo = score["verification"] == "demo_unverified"
+            badge = (svg, _GH_NEG_TTL if demo else 3600)
+            _cache_put(_BADGE_CACHE, agent_id, badge, _score_ttl(score))
+        svg, max_age = badge
+        self._write_bytes(200, 'image/svg+xml', svg, f'Cache-Control: max-age={max_age}\r\n')
 
     def do_POST(self):
         content_length = int(self.headers.get('Content-Length', 0))
         body = json.loads(self.rfile.read(content_length)) if content_length > 0 else {}
         
-        path = self.path.split('?')[0]
+        path, _, query = self.path.partition('?')
+        self._pretty = parse_qs(query).get('pretty') == ['1']
         
-        if '/verify' in path:
-            agent_id = body.get('agent_id', 'unknown')
-            evidence = body.get('evidence', {})
-            score = _calc_score(agent_id, evidence)
-            self._json(200, score)
-        elif '/batch' in path:
-            # Batch verify (Pro feature preview)
-            agents = body.get('agents', [])[:5]  # Free: max 5
-            results = [_calc_score(a) for a in agents]
-            self._json(200, {"results": results, "count": len(results)})
-        else:
-            self._json(404, {"error": "Not found"})
+        m = _ROUTE_RE.match(path)
+        h = _POST_ROUTES.get(m['op']) if m else None
+        if h:
+            return h(self, body)
+        self._json(404, {"error": "Not found"})
+
+    def _h_post_verify(self, body):
+        agent_id = body.get('agent_id', 'unknown')
+        evidence = body.get('evidence', {})
+        score = _calc_score(agent_id, evidence)
+        self._json(200, score)
+
+    def _h_batch(self, body):
+        # Batch verify (Pro feature preview)
+        agents = body.get('agents', [])[:5]  # Free: max 5
+        results = _calc_batch(agents)
+        self._json(200, {"results": results, "count": len(results)})
 
     def do_OPTIONS(self):
         self.send_response(200)
@@ -219,8 +408,40 @@ class handler(BaseHTTPRequestHandler):
         self.end_headers()
 
     def _json(self, code, data):
-        self.send_response(code)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(data, indent=2).encode())
+        self._write_bytes(code, 'application/json', _dumps(data, getattr(self, '_pretty', False)))
+
+    def _json_static(self, data, body):
+        # Precomputed compact body, re-encoded only when ?pretty=1 is asked for
+        self._write_bytes(200, 'application/json', _dumps(data, True) if self._pretty else body)
+
+    def _write_bytes(self, code, ctype, body, extra_headers=''):
+        # Status line, headers and body go out in a single write
+        head = (
+            f"{self.protocol_version} {code} {self.responses.get(code, ('',))[0]}\r\n"
+            f"Content-Type: {ctype}\r\nContent-Length: {len(body)}\r\n"
+            f"Access-Control-Allow-Origin: *\r\n{extra_headers}\r\n"
+        ).encode('latin-1')
+        self.log_request(code)
+        self.wfile.write(head + body)
+
+# One compiled pattern extracts the route and its argument: /[api/]<op>[/<arg>]
+_ROUTE_RE = re.compile(r'^/(?:api/)?(?P<op>verify|badge|factors|donate|health|pricing|batch)(?:/(?P<arg>.*))?$')
+
+_GET_ROUTES = {
+    'donate': handler._h_donate,
+    'health': handler._h_health,
+    'factors': handler._h_factors,
+    'pricing': handler._h_pricing,
+    'verify': handler._h_verify,
+    'badge': handler._h_badge,
+}
+
+_POST_ROUTES = {
+    'verify': handler._h_post_verify,
+    'batch': handler._h_batch,
+}
+
+
+if __name__ == "__main__":
+    # Local run: one thread per connection so slow GitHub lookups overlap
+    ThreadingHTTPServer(("0.0.0.0", int(os.getenv("PORT", "8000"))), handler).serve_forever()
@@ -8,11 +8,14 @@ Main FastAPI server providing trust verification for autonomous agents.
 
 from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
-from datetime import datetime
+from datetime import datetime, timezone
 import httpx
+import math
 import os
+import time
 import logging
 
 # Import pilot router
@@ -28,7 +31,8 @@ app = FastAPI(
     description="Trust score verification and provenance auditing for autonomous agents",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -47,6 +51,18 @@ app.include_router(pilot_router)
 TRUST_SCORE_API = os.getenv("TRUST_SCORE_API", "https://gerundium.sicmundus.dev/api/trust-score")
 PARENT_AGENT_EMAIL = os.getenv("PARENT_AGENT_EMAIL", "gerundium@agentmail.to")
 
+# Same shape as api/index.py's _now_iso, but naive to keep this service's
+# existing timestamp format: [epoch_second, formatted]
+_TS_CACHE = [0, ""]
+
+def utc_timestamp() -> str:
+    """Current UTC time as a naive ISO string, formatted at most once per second"""
+    t = int(time.time())
+    if t != _TS_CACHE[0]:
+        _TS_CACHE[1] = datetime.fromtimestamp(t, timezone.utc).replace(tzinfo=None).isoformat()
+        _TS_CACHE[0] = t
+    return _TS_CACHE[1]
+
 # Data models
 class TrustVerificationRequest(BaseModel):
     """Request to verify an agent's trust score"""
@@ -103,7 +119,7 @@ async def root():
             "evm": "0x1Ba5618Dc4a26e0495B089A569EFC64F9D2Ad689",
             "sol": "6KsvHjfHjW3UtqoFJcbdmy1byLDw99xrtV4ddwGu8qMk"
         },
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": utc_timestamp()
     }
 
 @app.get("/health")
@@ -111,7 +127,7 @@ async def health():
     """Detailed health check"""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": utc_timestamp(),
         "dependencies": {
             "trust_score_api": TRUST_SCORE_API,
             "parent_agent": PARENT_AGENT_EMAIL
@@ -138,7 +154,7 @@ async def donate():
     }
 
 # Core verification endpoints
-@app.post("/api/v1/verify-trust", response_model=TrustVerificationResponse)
+@app.post("/api/v1/verify-trust", response_model=None, responses={200: {"model": TrustVerificationResponse}})
 async def verify_trust(
     request: TrustVerificationRequest,
     authorization: Optional[str] = Header(None)
@@ -157,6 +173,7 @@ async def verify_trust(
     try:
         # Call parent's Trust Score API
         trust_score, components = await calculate_trust_score(
+            app.state.httpx,
             request.agent_id, 
             request.context,
             request.platforms
@@ -165,21 +182,25 @@ async def verify_trust(
         # Determine verification confidence
         confidence = calculate_confidence(components, request.platforms)
         
-        return TrustVerificationResponse(
-            agent_id=request.agent_id,
-            trust_score=trust_score,
-            components=components,
-            verified=True,
-            confidence=confidence,
-            timestamp=datetime.utcnow(),
-            message=f"Trust score calculated successfully"
-        )
+        # Every component is bounded to 0-100 (the upstream parent score is
+        # clamped in calculate_trust_score), so outbound model validation
+        # is skipped
+        return ORJSONResponse({
+            "agent_id": request.agent_id,
+            "trust_score": trust_score,
+            "components": components,
+            "verified": True,
+            "confidence": confidence,
+            "timestamp": datetime.utcnow(),
+            "proof_url": None,
+            "message": "Trust score calculated successfully"
+        })
         
     except Exception as e:
         logger.error(f"Trust verification failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/v1/verify-provenance", response_model=ProvenanceVerificationResponse)
+@app.post("/api/v1/verify-provenance", response_model=None, responses={200: {"model": ProvenanceVerificationResponse}})
 async def verify_provenance(
     request: ProvenanceVerificationRequest,
     authorization: Optional[str] = Header(None)
@@ -194,15 +215,16 @@ async def verify_provenance(
     try:
         # TODO: Integrate Smooth.sh for browser automation
         # For now, return placeholder
-        return ProvenanceVerificationResponse(
-            verified=False,
-            confidence=0.0,
-            timestamp=datetime.utcnow(),
-            details={
+        return ORJSONResponse({
+            "verified": False,
+            "confidence": 0.0,
+            "recording_url": None,
+            "timestamp": datetime.utcnow(),
+            "details": {
                 "status": "not_implemented",
                 "message": "Smooth.sh integration pending"
             }
-        )
+        })
         
     except Exception as e:
         logger.error(f"Provenance verification failed: {str(e)}")
@@ -226,6 +248,7 @@ async def get_agent_profile(agent_id: str):
 
 # Helper functions
 async def calculate_trust_score(
+    client: httpx.AsyncClient,
     agent_id: str, 
     context: Dict[str, Any],
     platforms: Optional[List[str]]
@@ -233,23 +256,24 @@ async def calculate_trust_score(
     """
     Calculate trust score by calling Gerundium's Trust Score API
     and performing additional verification
+
+    Uses the app-scoped client so connections are kept alive across requests.
     """
     components = {}
     
     # 1. Call parent's Trust Score API
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                TRUST_SCORE_API,
-                json={"agent_id": agent_id, "context": context},
-                timeout=10.0
-            )
-            if response.status_code == 200:
-                data = response.json()
-                components["parent_score"] = data.get("score", 50.0)
-            else:
-                logger.warning(f"Trust Score API returned {response.status_code}")
-                components["parent_score"] = 50.0  # Neutral score
+        response = await client.post(
+            TRUST_SCORE_API,
+            json={"agent_id": agent_id, "context": context},
+            timeout=10.0
+        )
+        if response.status_code == 200:
+            data = response.json()
+            components["parent_score"] = normalize_parent_score(data.get("score", 50.0))
+        else:
+            logger.warning(f"Trust Score API returned {response.status_code}")
+            components["parent_score"] = 50.0  # Neutral score
     except Exception as e:
         logger.error(f"Failed to call Trust Score API: {str(e)}")
         components["parent_score"] = 50.0
@@ -297,6 +321,17 @@ async def verify_platforms(agent_id: str, platforms: List[str]) -> float:
     
     return (verified_count / total_platforms) * 100
 
+def normalize_parent_score(value: Any) -> float:
+    """
+    Bound the parent Trust Score API's score to 0-100
+
+    Non-numeric or NaN values fall back to the neutral 50.0
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or math.isnan(value):
+        logger.warning(f"Trust Score API returned invalid score: {value!r}")
+        return 50.0
+    return min(max(float(value), 0.0), 100.0)
+
 def calculate_confidence(components: Dict[str, float], platforms: Optional[List[str]]) -> float:
     """
     Calculate confidence in verification based on available data
@@ -317,8 +352,13 @@ def calculate_confidence(components: Dict[str, float], platforms: Optional[List[
 # Startup event
 @app.on_event("startup")
 async def startup_event():
-    """Log startup information"""
+    """Create shared HTTP client and log startup information"""
     logger.info("TrustVerifier Agent starting...")
+    app.state.httpx = httpx.AsyncClient(
+        timeout=10.0,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+    )
     logger.info(f"Parent: {PARENT_AGENT_EMAIL}")
     logger.info(f"Trust Score API: {TRUST_SCORE_API}")
     logger.info("Service operational")
@@ -326,8 +366,9 @@ async def startup_event():
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Log shutdown information"""
+    """Close shared HTTP client and log shutdown information"""
     logger.info("TrustVerifier Agent shutting down...")
+    await app.state.httpx.aclose()
 
 if __name__ == "__main__":
     import uvicorn
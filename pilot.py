@@ -3,26 +3,52 @@ Agent Trust Stack Pilot - Endpoints for Nanook collaboration
 Created: 2026-02-18
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from typing import Optional, Dict, Any, List
-from datetime import datetime, date
-import json
+from datetime import datetime, date, timezone
+import asyncio
+import functools
+import hashlib
+import logging
+import orjson
 import os
+import tempfile
+import threading
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 # Initialize router
 router = APIRouter(prefix="/pilot", tags=["pilot"])
 
 # Data directory (use /tmp for Vercel compatibility)
-PILOT_DATA_DIR = Path("/tmp/pilot_data") if os.path.exists("/tmp") else Path("pilot_data")
+try:
+    os.stat("/tmp")
+    PILOT_DATA_DIR = Path("/tmp/pilot_data")
+except OSError:
+    PILOT_DATA_DIR = Path("pilot_data")
 SNAPSHOTS_DIR = PILOT_DATA_DIR / "snapshots"
 SCORES_DIR = PILOT_DATA_DIR / "scores"
 
+# Each agent's snapshots live in one append-only log, one JSON object per line
+SNAPSHOT_LOG = "snapshots.jsonl"
+
+# compute_pdr only looks at the first and last PDR_WINDOW_DAYS snapshots, so
+# the score path reads a small window file holding just those dates; the
+# full log stays on disk as the audit trail
+PDR_WINDOW_DAYS = 7
+SNAPSHOT_WINDOW = "window.jsonl"
+
 # Ensure directories exist
 SNAPSHOTS_DIR.mkdir(parents=True, exist_ok=True)
 SCORES_DIR.mkdir(parents=True, exist_ok=True)
 
+# Serialized /cohort response: (etag, body). Only served while its ETag
+# still matches the current index, so writers never need to clear it
+_cohort_cache: Optional[tuple[str, bytes]] = None
+
 # Pilot cohort (10 agents)
 PILOT_COHORT = {
     "getclawe": {"score_baseline": 8, "category": "coordination"},
@@ -37,6 +63,34 @@ PILOT_COHORT = {
     "toml0006": {"score_baseline": 6, "category": "observability"}
 }
 
+# The cohort is static: precompute membership and per-agent records once
+_COHORT_IDS: frozenset[str] = frozenset(PILOT_COHORT)
+_COHORT_RECORDS = tuple(
+    (aid, meta["category"], meta.get("voluntary", False)) for aid, meta in PILOT_COHORT.items()
+)
+
+# In-memory cohort summary per agent, so /cohort does no filesystem work.
+# Hydrated from disk at import, then kept current by ingest and score
+# computation. "dates" is only touched under the agent's lock; readers use
+# the immutable (count, latest) "snapshots" tuple, which is replaced whole.
+# "score_version" is the window mtime "score" was computed from
+_COHORT_INDEX: Dict[str, Dict[str, Any]] = {
+    aid: {"dates": set(), "snapshots": (0, None), "score": None, "score_version": 0}
+    for aid in PILOT_COHORT
+}
+
+# Where each date's latest line sits in the agent's snapshot log:
+# date -> (byte offset, length). Filled at import, extended on ingest
+_SNAPSHOT_OFFSETS: Dict[str, Dict[str, tuple[int, int]]] = {aid: {} for aid in PILOT_COHORT}
+
+# Ingests run in the threadpool: each agent's log append, window rewrite and
+# index update happen under that agent's lock
+_AGENT_LOCKS: Dict[str, threading.Lock] = {aid: threading.Lock() for aid in PILOT_COHORT}
+
+# Per-agent snapshot directories are created once here, not on every ingest
+for _aid in PILOT_COHORT:
+    (SNAPSHOTS_DIR / _aid).mkdir(exist_ok=True)
+
 # Data models
 class SnapshotData(BaseModel):
     """Daily snapshot data from Nanook"""
@@ -69,66 +123,91 @@ class CohortStatus(BaseModel):
     agents: List[Dict[str, Any]]
     last_updated: datetime
 
+_SNAPSHOT_ADAPTER = TypeAdapter(SnapshotData)
+
 # Endpoints
+# Handlers doing only blocking file I/O are plain `def` so FastAPI runs them
+# in its threadpool; get_agent_score stays async and offloads its reads/writes
 
-@router.post("/ingest")
-async def ingest_snapshot(snapshot: SnapshotData):
+@router.post("/ingest", response_class=ORJSONResponse)
+def ingest_snapshot(snapshot: SnapshotData):
     """
     Ingest daily snapshot data from Nanook
     
     Stores raw snapshot data for later processing
     """
     # Validate agent is in cohort
-    if snapshot.agent_id not in PILOT_COHORT:
+    if snapshot.agent_id not in _COHORT_IDS:
         raise HTTPException(
             status_code=400, 
             detail=f"Agent {snapshot.agent_id} not in pilot cohort"
         )
     
-    # Create agent directory if needed
     agent_dir = SNAPSHOTS_DIR / snapshot.agent_id
-    agent_dir.mkdir(exist_ok=True)
     
-    # Save snapshot
-    snapshot_file = agent_dir / f"{snapshot.date}.json"
-    with open(snapshot_file, 'w') as f:
-        json.dump(snapshot.dict(), f, indent=2)
+    # Append snapshot to the agent's log (a re-ingested date supersedes the earlier line)
+    snapshot_file = agent_dir / SNAPSHOT_LOG
+    with _AGENT_LOCKS[snapshot.agent_id]:
+        line = snapshot.model_dump_json().encode()
+        with open(snapshot_file, 'ab') as f:
+            offset = f.tell()
+            f.write(line + b"\n")
+        _SNAPSHOT_OFFSETS[snapshot.agent_id][snapshot.date] = (offset, len(line))
+        # Index the date as soon as it is in the log
+        index_snapshot_date(_COHORT_INDEX[snapshot.agent_id], snapshot.date)
+        
+        # Fold the snapshot into the scoring window
+        window = {s.date: s for s in read_snapshot_log(agent_dir, SNAPSHOT_WINDOW) or []}
+        window[snapshot.date] = snapshot
+        write_snapshot_window(agent_dir, [window[d] for d in sorted(window)])
     
     # Log receipt
-    return {
+    return ORJSONResponse(content={
         "status": "ingested",
         "agent_id": snapshot.agent_id,
         "date": snapshot.date,
         "file": str(snapshot_file),
-        "timestamp": datetime.utcnow().isoformat()
-    }
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    })
 
-@router.get("/score/{agent_id}", response_model=TrustScore)
-async def get_agent_score(agent_id: str):
+@router.get("/score/{agent_id}", response_model=None, responses={200: {"model": TrustScore}})
+async def get_agent_score(agent_id: str, request: Request):
     """
     Compute and return trust score for an agent
     
-    Computes PDR from stored snapshot data
+    Computes PDR from stored snapshot data. The ETag is the mtime of the
+    snapshot window the score was computed from, so a matching
+    If-None-Match gets a bodiless 304
     """
     # Validate agent
-    if agent_id not in PILOT_COHORT:
+    if agent_id not in _COHORT_IDS:
         raise HTTPException(
             status_code=404,
             detail=f"Agent {agent_id} not in pilot cohort"
         )
     
-    # Load all snapshots for this agent
     agent_dir = SNAPSHOTS_DIR / agent_id
-    if not agent_dir.exists():
+    score_file = SCORES_DIR / f"{agent_id}.json"
+    
+    # Disk reads run in a worker thread so they don't block the event loop
+    # Reuse the cached score if it was computed from the current window
+    window_mtime = await asyncio.to_thread(cached_score_version, agent_dir, score_file)
+    if window_mtime is not None:
+        etag = _score_etag(window_mtime)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        # The score file holds the serialized response: send it as-is
+        body = await asyncio.to_thread(read_score_file, score_file)
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+    
+    # Load the snapshots the score depends on (never the full history)
+    loaded = await asyncio.to_thread(load_snapshot_window, agent_dir)
+    if loaded is None:
         raise HTTPException(
             status_code=404,
             detail=f"No snapshot data found for agent {agent_id}"
         )
-    
-    snapshots = []
-    for snapshot_file in sorted(agent_dir.glob("*.json")):
-        with open(snapshot_file) as f:
-            snapshots.append(json.load(f))
+    window_mtime, snapshots = loaded
     
     if not snapshots:
         raise HTTPException(
@@ -141,95 +220,330 @@ async def get_agent_score(agent_id: str):
     quality_score = compute_quality_score(snapshots)
     overall_score = (pdr * 70) + (quality_score * 0.3)  # Weighted average
     
-    score = TrustScore(
+    # Every field comes from our own computation: skip validation
+    score = TrustScore.model_construct(
         agent_id=agent_id,
         pdr=pdr,
+        ass=None,
+        mdr=None,
         quality_score=quality_score,
         overall_score=overall_score,
         provenance_chain=provenance,
-        last_updated=datetime.utcnow()
+        last_updated=datetime.now(timezone.utc)
     )
     
-    # Cache score
-    score_file = SCORES_DIR / f"{agent_id}.json"
-    with open(score_file, 'w') as f:
-        json.dump(score.dict(), f, indent=2, default=str)
+    # Serialize once for both the score cache and the response
+    body = score.model_dump_json().encode()
+    await asyncio.to_thread(write_score_file, score_file, body, window_mtime)
+    
+    # Computations over different windows can finish in either order: only
+    # let a score from a window at least as new as the indexed one through.
+    # This runs on the event loop thread, so the check and set can't interleave
+    entry = _COHORT_INDEX[agent_id]
+    if window_mtime >= entry["score_version"]:
+        entry["score"] = overall_score
+        entry["score_version"] = window_mtime
     
-    return score
+    return Response(content=body, media_type="application/json", headers={"ETag": _score_etag(window_mtime)})
 
-@router.get("/cohort", response_model=CohortStatus)
-async def get_cohort_status():
+@router.get("/cohort", response_model=None, responses={200: {"model": CohortStatus}})
+def get_cohort_status(request: Request):
     """
     Get status of entire pilot cohort
+
+    Built from the in-memory cohort index. The ETag is a hash of the
+    index state, so a matching If-None-Match gets a bodiless 304; the
+    serialized body is cached under the ETag it was built for
     """
+    global _cohort_cache
+    # One read of the index feeds both the ETag and the body
+    state = _cohort_state()
+    etag = _cohort_etag(state)
+    headers = {"ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    # Read the global once: other threads may replace it meanwhile
+    cached = _cohort_cache
+    if cached and cached[0] == etag:
+        return Response(content=cached[1], media_type="application/json", headers=headers)
+    
     agents = []
     snapshot_dates_set = set()
     
-    for agent_id in PILOT_COHORT:
-        agent_dir = SNAPSHOTS_DIR / agent_id
-        snapshot_count = 0
-        latest_date = None
-        
-        if agent_dir.exists():
-            snapshot_files = list(agent_dir.glob("*.json"))
-            snapshot_count = len(snapshot_files)
-            
-            if snapshot_files:
-                latest_file = sorted(snapshot_files)[-1]
-                latest_date = latest_file.stem
-                snapshot_dates_set.add(latest_date)
+    for (agent_id, category, voluntary), ((snapshot_count, latest_date), score) in zip(_COHORT_RECORDS, state):
         
-        # Load cached score if available
-        score_file = SCORES_DIR / f"{agent_id}.json"
-        cached_score = None
-        if score_file.exists():
-            with open(score_file) as f:
-                cached_score = json.load(f)
+        if latest_date:
+            snapshot_dates_set.add(latest_date)
         
         agents.append({
             "agent_id": agent_id,
-            "category": PILOT_COHORT[agent_id]["category"],
-            "voluntary": PILOT_COHORT[agent_id].get("voluntary", False),
+            "category": category,
+            "voluntary": voluntary,
             "snapshot_count": snapshot_count,
             "latest_snapshot": latest_date,
-            "current_score": cached_score.get("overall_score") if cached_score else None
+            "current_score": score
         })
     
     active_agents = sum(1 for a in agents if a["snapshot_count"] > 0)
     
-    return CohortStatus(
+    status = CohortStatus(
         total_agents=len(PILOT_COHORT),
         active_agents=active_agents,
         snapshot_dates=sorted(snapshot_dates_set),
         agents=agents,
-        last_updated=datetime.utcnow()
+        last_updated=datetime.now(timezone.utc)
     )
+    body = status.model_dump_json().encode()
+    _cohort_cache = (etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.get("/snapshot/{agent_id}/{snapshot_date}")
-async def get_snapshot(agent_id: str, snapshot_date: str):
+def get_snapshot(agent_id: str, snapshot_date: str):
     """
     Get raw snapshot data for transparency
     """
-    if agent_id not in PILOT_COHORT:
+    if agent_id not in _COHORT_IDS:
         raise HTTPException(
             status_code=404,
             detail=f"Agent {agent_id} not in pilot cohort"
         )
     
-    snapshot_file = SNAPSHOTS_DIR / agent_id / f"{snapshot_date}.json"
+    raw = read_snapshot_line(agent_id, snapshot_date)
     
-    if not snapshot_file.exists():
+    if raw is None:
         raise HTTPException(
             status_code=404,
             detail=f"No snapshot found for {agent_id} on {snapshot_date}"
         )
     
-    with open(snapshot_file) as f:
-        return json.load(f)
+    # The stored line is already valid JSON: return it as-is
+    return Response(content=raw, media_type="application/json")
 
 # Helper functions
 
-def compute_pdr(agent_id: str, snapshots: List[Dict]) -> tuple[float, Dict[str, Any]]:
+# Provenance fields that are the same for every PDR computation
+_PROV_CONST = {
+    "method": "velocity_based_pdr_v1",
+    "source": "nanook_snapshots",
+    "formula": "PDR = current_velocity / baseline_velocity (capped at 2.0)",
+    "verifier": "gerundium@agentmail.to"
+}
+
+def _cohort_state() -> List[tuple]:
+    """Per-agent ((count, latest), score) from the index, in _COHORT_RECORDS order"""
+    return [
+        (_COHORT_INDEX[aid]["snapshots"], _COHORT_INDEX[aid]["score"])
+        for aid, _, _ in _COHORT_RECORDS
+    ]
+
+def _cohort_etag(state: List[tuple]) -> str:
+    """ETag over the cohort index state that /cohort is built from"""
+    return '"%s"' % hashlib.blake2b(orjson.dumps(state), digest_size=8).hexdigest()
+
+def index_snapshot_date(entry: Dict[str, Any], snapshot_date: str) -> None:
+    """Record a snapshot date in an agent's index entry; caller holds the agent's lock"""
+    dates = entry["dates"]
+    dates.add(snapshot_date)
+    latest = entry["snapshots"][1]
+    entry["snapshots"] = (len(dates), snapshot_date if latest is None else max(latest, snapshot_date))
+
+def _score_etag(window_mtime: int) -> str:
+    """ETag for a score, derived from the mtime of the window it was computed from"""
+    return f'"{window_mtime:x}"'
+
+def cached_score_version(agent_dir: Path, score_file: Path) -> Optional[int]:
+    """
+    Return the window mtime the cached score was computed from, if still current
+
+    write_score_file stamps the score file with that window mtime, so the
+    cache is fresh only while the two match exactly. Only stats the two
+    files; returns None when a recompute is needed
+    """
+    try:
+        score_mtime = os.stat(score_file).st_mtime_ns
+        window_mtime = os.stat(agent_dir / SNAPSHOT_WINDOW).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    
+    if score_mtime != window_mtime:
+        return None
+    return window_mtime
+
+def load_snapshot_window(agent_dir: Path) -> Optional[tuple[int, List[SnapshotData]]]:
+    """
+    Read an agent's scoring window along with its mtime
+
+    The mtime is taken before the read: if an ingest replaces the window in
+    between, the score is stamped with the older mtime and simply
+    recomputed on the next request
+    """
+    try:
+        window_mtime = os.stat(agent_dir / SNAPSHOT_WINDOW).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    snapshots = read_snapshot_log(agent_dir, SNAPSHOT_WINDOW)
+    if snapshots is None:
+        return None
+    return window_mtime, snapshots
+
+def read_score_file(score_file: Path) -> bytes:
+    """Load a cached score's serialized JSON"""
+    with open(score_file, 'rb') as f:
+        return f.read()
+
+def write_score_file(score_file: Path, body: bytes, window_mtime: int) -> None:
+    """
+    Persist a serialized score for the cohort view and later reuse
+
+    Replaced atomically, since cache hits send the file as-is from other
+    threads. The file's mtime is set to the mtime of the window the score
+    came from
+    """
+    write_atomic(score_file, body, mtime_ns=window_mtime)
+
+def read_snapshot_log(
+    agent_dir: Path,
+    log_name: str = SNAPSHOT_LOG,
+    offsets: Optional[Dict[str, tuple[int, int]]] = None
+) -> Optional[List[SnapshotData]]:
+    """
+    Read an agent's snapshot log, one snapshot per date, ordered by date
+
+    Later lines for the same date win, matching the old overwrite-on-ingest
+    behaviour. Lines that don't decode (e.g. a torn final append) are
+    logged and skipped. If offsets is given, it is filled with each date's
+    winning (byte offset, length). Returns None if the agent has no log
+    """
+    log_file = agent_dir / log_name
+    try:
+        with open(log_file, 'rb') as f:
+            lines = f.read().split(b"\n")
+    except FileNotFoundError:
+        return None
+    
+    by_date = {}
+    offset = 0
+    for lineno, line in enumerate(lines, 1):
+        start = offset
+        offset += len(line) + 1
+        if line:
+            # Parse and validate straight from bytes
+            try:
+                snapshot = _SNAPSHOT_ADAPTER.validate_json(line)
+            except ValidationError:
+                logger.warning(f"Skipping unreadable line {lineno} in {log_file}")
+                continue
+            by_date[snapshot.date] = snapshot
+            if offsets is not None:
+                offsets[snapshot.date] = (start, len(line))
+    return [by_date[d] for d in sorted(by_date)]
+
+def terminate_log(log_file: Path) -> None:
+    """Newline-terminate a log left mid-line by a crash, so appends start clean"""
+    try:
+        with open(log_file, 'rb+') as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    except FileNotFoundError:
+        pass
+
+def write_snapshot_window(agent_dir: Path, snapshots: List[SnapshotData]) -> None:
+    """Rewrite an agent's scoring window from date-ordered snapshots"""
+    write_atomic(agent_dir / SNAPSHOT_WINDOW, snapshot_window_bytes(snapshots))
+
+def snapshot_window_bytes(snapshots: List[SnapshotData]) -> bytes:
+    """
+    Serialize the scoring window for date-ordered snapshots
+
+    Keeps the first and last PDR_WINDOW_DAYS dates; anything in between
+    can no longer affect the score and lives only in the full log
+    """
+    if len(snapshots) > 2 * PDR_WINDOW_DAYS:
+        snapshots = snapshots[:PDR_WINDOW_DAYS] + snapshots[-PDR_WINDOW_DAYS:]
+    return b"".join(s.model_dump_json().encode() + b"\n" for s in snapshots)
+
+def write_atomic(path: Path, data: bytes, mtime_ns: Optional[int] = None) -> None:
+    """
+    Replace a file's contents via a uniquely named temp file and os.replace
+
+    If mtime_ns is given, the new file carries that mtime from the moment
+    it becomes visible
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        if mtime_ns is not None:
+            os.utime(tmp_name, ns=(mtime_ns, mtime_ns))
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+def read_snapshot_line(agent_id: str, snapshot_date: str) -> Optional[bytes]:
+    """
+    Return the raw log line holding an agent's latest snapshot for a date
+
+    Seeks straight to it using the in-memory offset index, so the cost
+    does not grow with the length of the log
+    """
+    location = _SNAPSHOT_OFFSETS[agent_id].get(snapshot_date)
+    if location is None:
+        return None
+    
+    offset, length = location
+    with open(SNAPSHOTS_DIR / agent_id / SNAPSHOT_LOG, 'rb') as f:
+        f.seek(offset)
+        return f.read(length)
+
+def migrate_legacy_snapshots(agent_dir: Path) -> None:
+    """
+    Fold per-day {date}.json snapshot files into the agent's snapshot log
+
+    Legacy entries are placed ahead of any existing log lines, so data
+    ingested after the switch still takes precedence for the same date.
+    Files that don't validate as a snapshot are logged and left on disk
+    untouched
+    """
+    # scandir entries carry the file type, so no per-file stat is needed
+    with os.scandir(agent_dir) as entries:
+        legacy = sorted(
+            Path(e.path) for e in entries if e.name.endswith(".json") and e.is_file()
+        )
+    if not legacy:
+        return
+    
+    log_file = agent_dir / SNAPSHOT_LOG
+    try:
+        existing = log_file.read_bytes()
+    except FileNotFoundError:
+        existing = b""
+    
+    lines = []
+    migrated = []
+    for p in legacy:
+        with open(p, 'rb') as f:
+            try:
+                snapshot = _SNAPSHOT_ADAPTER.validate_json(f.read())
+            except ValidationError:
+                logger.warning(f"Leaving invalid legacy snapshot {p} in place")
+                continue
+        lines.append(snapshot.model_dump_json().encode() + b"\n")
+        migrated.append(p)
+    if not migrated:
+        return
+    
+    if existing and not existing.endswith(b"\n"):
+        existing += b"\n"
+    write_atomic(log_file, b"".join(lines) + existing)
+    for p in migrated:
+        p.unlink()
+
+def compute_pdr(agent_id: str, snapshots: List[SnapshotData]) -> tuple[float, Dict[str, Any]]:
     """
     Compute Promise Delivery Ratio from snapshot data
     
@@ -244,16 +558,14 @@ def compute_pdr(agent_id: str, snapshots: List[Dict]) -> tuple[float, Dict[str,
     current_snapshot = snapshots[-1]
     
     # Calculate baseline velocity
-    baseline_commits = sum(s.get("commits", 0) for s in baseline_snapshots)
-    baseline_releases = sum(s.get("releases", 0) for s in baseline_snapshots)
+    baseline_commits, baseline_releases = _window_totals(baseline_snapshots)
     baseline_days = len(baseline_snapshots)
     
     baseline_velocity = (baseline_commits + baseline_releases * 5) / baseline_days
     
     # Calculate current velocity (last 7 days)
     recent_snapshots = snapshots[-7:] if len(snapshots) >= 7 else snapshots
-    current_commits = sum(s.get("commits", 0) for s in recent_snapshots)
-    current_releases = sum(s.get("releases", 0) for s in recent_snapshots)
+    current_commits, current_releases = _window_totals(recent_snapshots)
     current_days = len(recent_snapshots)
     
     current_velocity = (current_commits + current_releases * 5) / current_days
@@ -264,29 +576,32 @@ def compute_pdr(agent_id: str, snapshots: List[Dict]) -> tuple[float, Dict[str,
     else:
         pdr = min(current_velocity / baseline_velocity, 2.0)  # Cap at 2.0 (200%)
     
-    # Build provenance
-    provenance = {
-        "method": "velocity_based_pdr_v1",
-        "source": "nanook_snapshots",
-        "computation": {
-            "baseline_commits": baseline_commits,
-            "baseline_releases": baseline_releases,
-            "baseline_days": baseline_days,
-            "baseline_velocity": round(baseline_velocity, 2),
-            "current_commits": current_commits,
-            "current_releases": current_releases,
-            "current_days": current_days,
-            "current_velocity": round(current_velocity, 2),
-            "pdr": round(pdr, 3)
-        },
-        "formula": "PDR = current_velocity / baseline_velocity (capped at 2.0)",
-        "timestamp": datetime.utcnow().isoformat(),
-        "verifier": "gerundium@agentmail.to"
+    # Build provenance from the invariant template plus per-call fields
+    provenance = _PROV_CONST.copy()
+    provenance["computation"] = {
+        "baseline_commits": baseline_commits,
+        "baseline_releases": baseline_releases,
+        "baseline_days": baseline_days,
+        "baseline_velocity": round(baseline_velocity, 2),
+        "current_commits": current_commits,
+        "current_releases": current_releases,
+        "current_days": current_days,
+        "current_velocity": round(current_velocity, 2),
+        "pdr": round(pdr, 3)
     }
+    provenance["timestamp"] = datetime.now(timezone.utc).isoformat()
     
     return pdr, provenance
 
-def compute_quality_score(snapshots: List[Dict]) -> float:
+def _window_totals(window: List[SnapshotData]) -> tuple[int, int]:
+    """Sum commits and releases over a snapshot window in a single pass"""
+    commits = releases = 0
+    for s in window:
+        commits += s.commits
+        releases += s.releases
+    return commits, releases
+
+def compute_quality_score(snapshots: List[SnapshotData]) -> float:
     """
     Compute quality score from observables
     
@@ -297,13 +612,49 @@ def compute_quality_score(snapshots: List[Dict]) -> float:
     
     latest = snapshots[-1]
     
-    stars = latest.get("stars_gained", 0)
-    contributors = latest.get("contributors", 0)
-    issues_closed = latest.get("issues_closed", 0)
-    
+    return _quality_from_counts(
+        latest.stars_gained,
+        latest.contributors,
+        latest.issues_closed
+    )
+
+@functools.lru_cache(maxsize=64)
+def _quality_from_counts(stars: int, contributors: int, issues_closed: int) -> float:
+    """Quality score for one snapshot's observables, memoized per tuple"""
     quality = stars + (contributors * 5) + (issues_closed * 2)
     
     # Normalize to 0-100
     quality_score = min(quality * 2, 100)
     
     return quality_score
+
+# One-shot migration from the per-day {date}.json layout
+with os.scandir(SNAPSHOTS_DIR) as _entries:
+    for _entry in _entries:
+        if _entry.is_dir():
+            migrate_legacy_snapshots(Path(_entry.path))
+
+# Hydrate the cohort index from whatever is already on disk, and rebuild
+# any scoring window that is missing or disagrees with the full log
+for _aid, _entry in _COHORT_INDEX.items():
+    terminate_log(SNAPSHOTS_DIR / _aid / SNAPSHOT_LOG)
+    _snapshots = read_snapshot_log(SNAPSHOTS_DIR / _aid, offsets=_SNAPSHOT_OFFSETS[_aid])
+    if _snapshots is not None:
+        _window_file = SNAPSHOTS_DIR / _aid / SNAPSHOT_WINDOW
+        _expected = snapshot_window_bytes(_snapshots)
+        try:
+            _current = _window_file.read_bytes()
+        except FileNotFoundError:
+            _current = None
+        if _current != _expected:
+            write_atomic(_window_file, _expected)
+        for _s in _snapshots:
+            index_snapshot_date(_entry, _s.date)
+    try:
+        with open(SCORES_DIR / f"{_aid}.json", 'rb') as _f:
+            _entry["score"] = orjson.loads(_f.read()).get("overall_score")
+            _entry["score_version"] = os.fstat(_f.fileno()).st_mtime_ns
+    except FileNotFoundError:
+        pass
+    except orjson.JSONDecodeError:
+        logger.warning(f"Ignoring unreadable cached score for {_aid}")
@@ -9,18 +9,18 @@ import json
 
 BASE_URL = "http://localhost:8000"
 
-async def test_health():
+# Tests run concurrently on one shared client, so each prints its section
+# header only once its response is in, keeping the output blocks intact
+
+async def test_health(client: httpx.AsyncClient):
     """Test health endpoint"""
+    response = await client.get("/health")
     print("\n=== Testing Health Endpoint ===")
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{BASE_URL}/health")
-        print(f"Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
+    print(f"Status: {response.status_code}")
+    print(f"Response: {json.dumps(response.json(), indent=2)}")
 
-async def test_verify_trust():
+async def test_verify_trust(client: httpx.AsyncClient):
     """Test trust verification"""
-    print("\n=== Testing Trust Verification ===")
-    
     request_data = {
         "agent_id": "did:gerundium:test123",
         "context": {
@@ -30,28 +30,22 @@ async def test_verify_trust():
         "platforms": ["github", "nearai", "clawfriend"]
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{BASE_URL}/api/v1/verify-trust",
-            json=request_data,
-            timeout=10.0
-        )
-        print(f"Status: {response.status_code}")
-        if response.status_code == 200:
-            print(f"Response: {json.dumps(response.json(), indent=2)}")
-        else:
-            print(f"Error: {response.text}")
+    response = await client.post("/api/v1/verify-trust", json=request_data)
+    print("\n=== Testing Trust Verification ===")
+    print(f"Status: {response.status_code}")
+    if response.status_code == 200:
+        print(f"Response: {json.dumps(response.json(), indent=2)}")
+    else:
+        print(f"Error: {response.text}")
 
-async def test_get_profile():
+async def test_get_profile(client: httpx.AsyncClient):
     """Test agent profile retrieval"""
-    print("\n=== Testing Agent Profile ===")
-    
     agent_id = "did:gerundium:test123"
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{BASE_URL}/api/v1/agent/{agent_id}")
-        print(f"Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
+    response = await client.get(f"/api/v1/agent/{agent_id}")
+    print("\n=== Testing Agent Profile ===")
+    print(f"Status: {response.status_code}")
+    print(f"Response: {json.dumps(response.json(), indent=2)}")
 
 async def main():
     """Run all tests"""
@@ -60,9 +54,12 @@ async def main():
     print("=" * 60)
     
     try:
-        await test_health()
-        await test_verify_trust()
-        await test_get_profile()
+        async with httpx.AsyncClient(base_url=BASE_URL, timeout=10.0) as client:
+            await asyncio.gather(
+                test_health(client),
+                test_verify_trust(client),
+                test_get_profile(client)
+            )
         
         print("\n" + "=" * 60)
         print("✅ All tests completed!")
@@ -5,9 +5,12 @@ from datetime import datetime, date
 
 BASE_URL = "http://localhost:8000"
 
+# One session so all calls reuse the same connection
+session = requests.Session()
+
 def test_cohort():
     """Test cohort status endpoint"""
-    response = requests.get(f"{BASE_URL}/pilot/cohort")
+    response = session.get(f"{BASE_URL}/pilot/cohort")
     print(f"\n✅ GET /pilot/cohort: {response.status_code}")
     print(json.dumps(response.json(), indent=2))
 
@@ -24,13 +27,13 @@ def test_ingest():
         "contributors": 3
     }
     
-    response = requests.post(f"{BASE_URL}/pilot/ingest", json=snapshot)
+    response = session.post(f"{BASE_URL}/pilot/ingest", json=snapshot)
     print(f"\n✅ POST /pilot/ingest: {response.status_code}")
     print(json.dumps(response.json(), indent=2))
 
 def test_score():
     """Test score computation"""
-    response = requests.get(f"{BASE_URL}/pilot/score/getclawe")
+    response = session.get(f"{BASE_URL}/pilot/score/getclawe")
     print(f"\n✅ GET /pilot/score/getclawe: {response.status_code}")
     print(json.dumps(response.json(), indent=2))
 